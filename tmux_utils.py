@@ -1,30 +1,51 @@
 #!/usr/bin/env python3
 """Utility classes for introspecting and orchestrating tmux sessions."""
 
+import asyncio
+import io
 import json
+import os
 import queue
+import select
+import selectors
+import shlex
+import shutil
 import subprocess
+import sys
 import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TmuxWindow:
     """Represents a tmux window with its properties."""
     session_name: str
     window_index: int
     window_name: str
     active: bool
+    panes: int = 1
+    layout: str = ""
+    history_size: int = 0  # Lines scrolled into the active pane's history
+    activity: int = 0  # Epoch second of the window's last output
+    pane_id: str = ""  # Active pane, i.e. the one capture-pane reads
+    # Case-folded name, computed once for find_window_by_name
+    _name_cf: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # Frozen dataclass: derived fields have to bypass __setattr__
+        object.__setattr__(self, "_name_cf", self.window_name.casefold())
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TmuxSession:
     """Represents a tmux session with its windows."""
     name: str
-    windows: List[TmuxWindow]
+    windows: Tuple[TmuxWindow, ...]
     attached: bool
 
 
@@ -35,11 +56,72 @@ class TmuxError(Exception):
 class TmuxOrchestrator:
     """Manages tmux sessions and windows with safety features."""
 
-    def __init__(self, safety_mode: bool = True, cmd_timeout: int = 10):
+    # Record separator printed after each pane in a batched capture; tmux never
+    # stores control characters in the grid, so it cannot appear in pane text
+    _CAPTURE_SENTINEL = "\x1e"
+
+    # Adaptive polling: (max seconds since last change, poll interval) for hot
+    # and warm windows; anything idle longer is frozen
+    _POLL_TIERS = ((2.0, 0.5), (60.0, 2.5))
+    _FROZEN_POLL_INTERVAL = 30.0
+
+    # Seconds to wait before attaching the control client again after an
+    # attempt found no session to attach to
+    _CONTROL_RETRY_INTERVAL = 5.0
+
+    # Batched metadata queries shared by the sync and async session fetchers
+    _LIST_SESSIONS_CMD = (
+        "tmux",
+        "list-sessions",
+        "-F",
+        "#{session_name}\x1f#{session_attached}",
+    )
+    _LIST_WINDOWS_CMD = (
+        "tmux",
+        "list-windows",
+        "-a",
+        "-F",
+        "#{session_name}\x1f#{window_index}\x1f#{window_name}\x1f#{window_active}"
+        "\x1f#{window_panes}\x1f#{window_layout}\x1f#{history_size}"
+        "\x1f#{window_activity}\x1f#{pane_id}",
+    )
+
+    # Escapes applied to keys before send-keys, in a single translate() pass
+    _TMUX_ESCAPES = str.maketrans({";": r"\;", "$": r"\$", "`": r"\`"})
+
+    def __init__(
+        self, safety_mode: bool = True, cmd_timeout: int = 10, control_mode: bool = False
+    ):
         self._safety_mode = safety_mode  # Make immutable
+        # Absolute path lets subprocess use posix_spawn instead of fork+exec
+        self._tmux_path = shutil.which("tmux")
         self.max_lines_capture = 1000
         self.cmd_timeout = cmd_timeout
         self.max_lines_per_pane = 20  # Conservative default
+        self.max_capture_workers = 32
+        self.capture_batch_size = 32  # Windows captured per tmux invocation
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.sessions_ttl = 0.5  # Seconds a session/window snapshot stays valid
+        self._sessions_cache: Optional[Tuple[float, List[TmuxSession]]] = None
+        # Flat (struct-of-arrays) view of the same snapshot for name lookups:
+        # case-folded window names and their matching (session, index) pairs
+        self._soa_cache: Tuple[List[str], List[Tuple[str, int]]] = ([], [])
+        # (session, window) -> (pane state, num_lines, captured at, lines)
+        self._hist_cache: Dict[
+            Tuple[str, int], Tuple[Tuple[int, int, str, str], int, float, Tuple[str, ...]]
+        ] = {}
+        # (session, window) -> (last seen pane state, monotonic time it changed)
+        self._last_activity: Dict[Tuple[str, int], Tuple[Tuple[int, int, str, str], float]] = {}
+        self._last_polled: Dict[Tuple[str, int], float] = {}
+        # Optional long-lived `tmux -C` client that serves read-only queries
+        self._control_mode = control_mode
+        self._control_lock = threading.Lock()
+        self._control_client: Optional["subprocess.Popen[bytes]"] = None
+        self._control_session: Optional[str] = None
+        self._control_retry_at = 0.0  # Monotonic time of the next attach attempt
+        self._control_lines: Deque[bytes] = deque()
+        self._control_partial = b""
 
     @property
     def safety_mode(self) -> bool:
@@ -48,54 +130,300 @@ class TmuxOrchestrator:
 
     def _safe_subprocess_large_output(
         self, cmd: List[str], timeout: Optional[int] = None
-    ) -> Tuple[str, str, int]:
-        """Safely run subprocess with large output handling to prevent deadlocks"""
+    ) -> Tuple[bytes, str, int]:
+        """Safely run subprocess with large output handling to prevent deadlocks
+
+        stdout is returned as raw bytes so hot-path parsers can split it
+        without a decode pass; stderr is decoded for error messages.
+        """
         if timeout is None:
             timeout = self.cmd_timeout
 
-        proc = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-        )
         try:
-            stdout, stderr = proc.communicate(timeout=timeout)
-            return stdout, stderr, proc.returncode
+            # run() kills and reaps the child itself on timeout
+            result = subprocess.run(
+                cmd,
+                executable=self._tmux_path,
+                capture_output=True,
+                timeout=timeout,
+                check=False,
+                close_fds=False,  # Required for the posix_spawn fast path
+            )
         except subprocess.TimeoutExpired as exc:
-            proc.kill()
-            stdout, stderr = proc.communicate()  # Clean up
             raise TmuxError(f"Command timeout after {timeout}s: {cmd}") from exc
+        return result.stdout, result.stderr.decode("utf-8", "replace"), result.returncode
 
-    def _safe_subprocess_stream(self, cmd: List[str], timeout: Optional[int] = None) -> str:
-        """Stream subprocess output to prevent memory exhaustion"""
+    def _safe_subprocess_stream(
+        self, cmd: List[str], timeout: Optional[int] = None
+    ) -> List[str]:
+        """Stream subprocess output as lines, without trailing whitespace, to
+        prevent memory exhaustion"""
         if timeout is None:
             timeout = self.cmd_timeout
 
         proc = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            cmd,
+            executable=self._tmux_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False,  # Required for the posix_spawn fast path
         )
         start_time = time.time()
-        chunks = []
+        # Memory safety: a bounded deque keeps only the newest lines
+        chunks: Deque[str] = deque(maxlen=self.max_lines_capture)
 
         try:
             if proc.stdout is None:
                 raise TmuxError("Process stdout is None")
             for line in iter(proc.stdout.readline, ""):
-                chunks.append(line)
+                chunks.append(line.rstrip())
                 if time.time() - start_time > timeout:
                     proc.kill()
                     raise TmuxError(f"Command timeout after {timeout}s: {cmd}")
 
-                # Memory safety: limit total size
-                if len(chunks) > self.max_lines_capture:
-                    break
-
             proc.wait()
-            return "".join(chunks)
+            return list(chunks)
         except Exception:
             proc.kill()
             raise
 
+    def _close_control_client(self) -> None:
+        """Terminate the control-mode client; callers must hold _control_lock"""
+        proc = self._control_client
+        self._control_client = None
+        self._control_session = None
+        self._control_lines.clear()
+        self._control_partial = b""
+        if proc is not None:
+            if proc.stdin is not None:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+            proc.kill()
+            proc.wait()
+
+    def _control_read_line(
+        self, proc: "subprocess.Popen[bytes]", deadline: float
+    ) -> Optional[bytes]:
+        """Read one protocol line from the control client, or None at EOF"""
+        if proc.stdout is None:
+            return None
+        fd = proc.stdout.fileno()
+        while not self._control_lines:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TmuxError("Control client timed out")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            *lines, self._control_partial = (self._control_partial + chunk).split(b"\n")
+            self._control_lines.extend(lines)
+        line = self._control_lines.popleft()
+        if line.startswith(b"%session-changed "):
+            self._control_session = line.split(b" ", 2)[2].decode("utf-8", "replace")
+        return line
+
+    def _ensure_control_client(self, timeout: int) -> Optional["subprocess.Popen[bytes]"]:
+        """Lazily attach a read-only control-mode client; callers hold _control_lock"""
+        proc = self._control_client
+        if proc is not None and proc.poll() is None:
+            return proc
+        self._close_control_client()
+        if time.monotonic() < self._control_retry_at:
+            return None
+
+        # A control client has to attach somewhere; never create a session for it
+        stdout, _, return_code = self._safe_subprocess_large_output(
+            ["tmux", "list-sessions", "-F", "#{session_name}"], timeout
+        )
+        if return_code != 0 or not stdout.strip():
+            self._control_retry_at = time.monotonic() + self._CONTROL_RETRY_INTERVAL
+            return None
+
+        proc = subprocess.Popen(
+            [
+                "tmux",
+                "-C",
+                "attach-session",
+                "-f",
+                "read-only,no-output,ignore-size",
+                "-t",
+                "=" + stdout.split(b"\n", 1)[0].decode("utf-8", "replace"),
+            ],
+            executable=self._tmux_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=False,
+        )
+        self._control_client = proc
+
+        # Wait until attached so session_attached already counts this client
+        # tmux reports a rejected attach as plain text on stdout before %exit
+        deadline = time.monotonic() + timeout
+        attach_error = False
+        while self._control_session is None:
+            line = self._control_read_line(proc, deadline)
+            if line is None:
+                self._close_control_client()
+                if attach_error:
+                    # e.g. tmux too old for attach -f: stop trying
+                    self._control_mode = False
+                else:
+                    # The session went away before we attached: retry later
+                    self._control_retry_at = time.monotonic() + self._CONTROL_RETRY_INTERVAL
+                return None
+            if not line.startswith((b"%", b"can't find session")):
+                attach_error = True
+        return proc
+
+    def _control_query(
+        self, cmd: List[str], timeout: int
+    ) -> Optional[Tuple[bytes, str, int]]:
+        """Run a read-only tmux command over the control client
+
+        Returns None when the control client is unavailable so the caller can
+        fall back to a regular subprocess.
+        """
+        if any("\n" in arg for arg in cmd):
+            return None
+
+        with self._control_lock:
+            try:
+                proc = self._ensure_control_client(timeout)
+                if proc is None or proc.stdin is None:
+                    return None
+
+                line = " ".join(arg if arg == ";" else shlex.quote(arg) for arg in cmd[1:])
+                proc.stdin.write(line.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+
+                # Every command in a ';' list answers with its own %begin/%end
+                # block; tmux stops at the first %error
+                deadline = time.monotonic() + timeout
+                expected = 1 + cmd.count(";") - (1 if cmd[-1] == ";" else 0)
+                output: List[bytes] = []
+                answered = 0
+                while answered < expected:
+                    line_bytes = self._control_read_line(proc, deadline)
+                    if line_bytes is None:
+                        self._close_control_client()
+                        return None
+                    if not line_bytes.startswith(b"%begin "):
+                        continue  # Notification between replies
+
+                    guard = line_bytes[len(b"%begin ") :]
+                    body: List[bytes] = []
+                    while True:
+                        line_bytes = self._control_read_line(proc, deadline)
+                        if line_bytes is None:
+                            self._close_control_client()
+                            return None
+                        if line_bytes in (b"%end " + guard, b"%error " + guard):
+                            break
+                        body.append(line_bytes)
+
+                    if not guard.endswith(b" 1"):
+                        continue  # Reply to a command this client did not send
+                    answered += 1
+                    if line_bytes.startswith(b"%error "):
+                        return b"", b"\n".join(body).decode("utf-8", "replace"), 1
+                    output.extend(body)
+
+                return b"".join(part + b"\n" for part in output), "", 0
+            except TmuxError as e:
+                # The reply stream is now out of step with our requests
+                self._close_control_client()
+                raise TmuxError(f"Command timeout after {timeout}s: {cmd}") from e
+            except OSError:
+                self._close_control_client()
+                return None
+
+    def _run_query(
+        self, cmd: List[str], timeout: Optional[int] = None
+    ) -> Tuple[bytes, str, int]:
+        """Run a read-only tmux command, reusing the control client when enabled"""
+        if timeout is None:
+            timeout = self.cmd_timeout
+        if self._control_mode:
+            result = self._control_query(cmd, timeout)
+            if result is not None:
+                return result
+        return self._safe_subprocess_large_output(cmd, timeout)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the shared pool used for concurrent tmux queries"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_capture_workers,
+                    thread_name_prefix="tmux-capture",
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the shared worker pool and control client, if started"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        with self._control_lock:
+            self._close_control_client()
+
+    @staticmethod
+    def _read_answer(
+        sel: selectors.BaseSelector, stdin_fd: int, prompt: str, timeout: float
+    ) -> bool:
+        """Read one line from a selectable stdin, giving up at the deadline
+
+        stdin is switched to non-blocking so readline() returns whatever
+        sys.stdin already buffered, or a partial line, instead of waiting;
+        anything past the newline stays buffered for the next reader.
+        """
+        deadline = time.monotonic() + timeout
+        blocking = os.get_blocking(stdin_fd)
+        os.set_blocking(stdin_fd, False)
+        try:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            answer = ""
+            ready = False
+            while True:
+                chunk = sys.stdin.readline()
+                answer += chunk
+                if answer.endswith("\n") or (ready and not chunk):
+                    break  # Full line, or EOF after a partial one
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not sel.select(remaining):
+                    return False
+                ready = True
+        finally:
+            os.set_blocking(stdin_fd, blocking)
+        return answer.strip().lower() == "yes"
+
     def _safe_confirm(self, prompt: str, timeout: float = 5.0) -> bool:
         """Cross-platform safe confirmation with timeout"""
+        if os.name != "nt":
+            try:
+                stdin_fd = sys.stdin.fileno()
+            except (AttributeError, OSError, ValueError):
+                stdin_fd = -1  # Replaced or detached stdin: use the thread fallback
+            if stdin_fd >= 0:
+                with selectors.DefaultSelector() as sel:
+                    try:
+                        sel.register(stdin_fd, selectors.EVENT_READ)
+                    except (OSError, ValueError):
+                        pass  # e.g. epoll rejects regular files and /dev/null
+                    else:
+                        return self._read_answer(sel, stdin_fd, prompt, timeout)
+
+        # Windows consoles and unselectable stdin (files, /dev/null, replaced
+        # sys.stdin) wait on a helper thread instead
         result_queue: queue.Queue[str] = queue.Queue()
 
         def get_input() -> None:
@@ -115,117 +443,322 @@ class TmuxOrchestrator:
         except queue.Empty:
             return False
 
+    def invalidate_sessions(self) -> None:
+        """Drop the cached session snapshot so the next query hits tmux"""
+        self._sessions_cache = None
+
+    def _parse_sessions(self, sessions_stdout: bytes, windows_stdout: bytes) -> List[TmuxSession]:
+        """Build session objects from list-sessions and list-windows output
+
+        Lines and fields are split as bytes; only the string fields that end
+        up on the dataclasses are decoded.
+        """
+        # Keyed by the raw session name so window lines need no decode to match
+        session_data: Dict[bytes, Dict[str, Any]] = {}
+        # Fields are split on \x1f (unit separator), which unlike ':' cannot
+        # appear in names
+        for line in sessions_stdout.split(b"\n"):
+            if not line:
+                continue
+            raw_name, attached = line.split(b"\x1f", 1)
+            session_name = raw_name.decode("utf-8", "replace")
+            clients = int(attached)
+            if session_name == self._control_session:
+                clients -= 1  # Our own control client is not a user
+            session_data[raw_name] = {
+                "name": session_name,
+                "attached": clients > 0,
+                "windows": [],
+            }
+
+        # Parse and group windows by session
+        for window_line in windows_stdout.split(b"\n"):
+            if not window_line:
+                continue
+            parts = window_line.split(b"\x1f", 8)
+            if len(parts) == 9:
+                (
+                    raw_name,
+                    window_index,
+                    window_name,
+                    window_active,
+                    window_panes,
+                    window_layout,
+                    history_size,
+                    window_activity,
+                    pane_id,
+                ) = parts
+                data = session_data.get(raw_name)
+                if data is not None:
+                    windows_list = data["windows"]
+                    if isinstance(windows_list, list):
+                        windows_list.append(
+                            TmuxWindow(
+                                session_name=data["name"],
+                                window_index=int(window_index),
+                                window_name=window_name.decode("utf-8", "replace"),
+                                active=window_active == b"1",
+                                panes=int(window_panes),
+                                layout=window_layout.decode("ascii", "replace"),
+                                history_size=int(history_size),
+                                activity=int(window_activity),
+                                pane_id=pane_id.decode("ascii", "replace"),
+                            )
+                        )
+
+        # Build session objects
+        sessions: List[TmuxSession] = []
+        for data in session_data.values():
+            windows = data["windows"]
+            attached = data["attached"]
+            if isinstance(windows, list) and isinstance(attached, bool):
+                sessions.append(
+                    TmuxSession(
+                        name=data["name"],
+                        windows=tuple(windows),
+                        attached=attached,
+                    )
+                )
+        return sessions
+
+    def _cache_sessions(self, sessions: List[TmuxSession]) -> None:
+        """Store a fresh snapshot and its flat name index"""
+        self._soa_cache = (
+            [window._name_cf for session in sessions for window in session.windows],
+            [
+                (session.name, window.window_index)
+                for session in sessions
+                for window in session.windows
+            ],
+        )
+        self._sessions_cache = (time.monotonic(), sessions)
+
+    def _cached_sessions(self) -> Optional[List[TmuxSession]]:
+        """Return a copy of the session snapshot while it is within its TTL"""
+        cached = self._sessions_cache
+        if cached is not None and time.monotonic() - cached[0] < self.sessions_ttl:
+            return list(cached[1])
+        return None
+
     def get_tmux_sessions(self) -> List[TmuxSession]:
         """Get all tmux sessions and their windows with batched queries"""
+        cached = self._cached_sessions()
+        if cached is not None:
+            return cached
+
         try:
-            # Get sessions
-            sessions_cmd = [
-                "tmux",
-                "list-sessions",
-                "-F",
-                "#{session_name}:#{session_attached}",
-            ]
-            sessions_stdout, sessions_stderr, return_code = (
-                self._safe_subprocess_large_output(sessions_cmd)
+            sessions_stdout, sessions_stderr, return_code = self._run_query(
+                list(self._LIST_SESSIONS_CMD)
             )
             if return_code != 0:
                 raise TmuxError(f"Failed to get sessions: {sessions_stderr}")
 
             # Batch query all windows across all sessions
-            windows_cmd = [
-                "tmux",
-                "list-windows",
-                "-a",
-                "-F",
-                "#{session_name}:#{window_index}:#{window_name}:#{window_active}",
-            ]
-            windows_stdout, windows_stderr, return_code = (
-                self._safe_subprocess_large_output(windows_cmd)
+            windows_stdout, windows_stderr, return_code = self._run_query(
+                list(self._LIST_WINDOWS_CMD)
             )
             if return_code != 0:
                 raise TmuxError(f"Failed to get all windows: {windows_stderr}")
 
-            # Parse sessions
-            session_data: Dict[str, Dict[str, Any]] = {}
-            for line in sessions_stdout.strip().split("\n"):
-                if not line:
-                    continue
-                session_name, attached = line.split(":")
-                session_data[session_name] = {
-                    "attached": attached == "1",
-                    "windows": [],
-                }
+            sessions = self._parse_sessions(sessions_stdout, windows_stdout)
+            self._cache_sessions(sessions)
+            return list(sessions)
+        except (subprocess.CalledProcessError, TmuxError) as e:
+            raise TmuxError(f"Error getting tmux sessions: {e}") from e
 
-            # Parse and group windows by session
-            for window_line in windows_stdout.strip().split("\n"):
-                if not window_line:
-                    continue
-                parts = window_line.split(":")
-                if len(parts) >= 4:
-                    session_name, window_index, window_name, window_active = (
-                        parts[0],
-                        parts[1],
-                        parts[2],
-                        parts[3],
-                    )
-                    if session_name in session_data:
-                        windows_list = session_data[session_name]["windows"]
-                        if isinstance(windows_list, list):
-                            windows_list.append(
-                                TmuxWindow(
-                                    session_name=session_name,
-                                    window_index=int(window_index),
-                                    window_name=window_name,
-                                    active=window_active == "1",
-                                )
-                            )
+    @staticmethod
+    def _pane_state(window: TmuxWindow) -> Tuple[int, int, str, str]:
+        """Values that change whenever the captured pane's text can change"""
+        return window.history_size, window.activity, window.pane_id, window.layout
 
-            # Build session objects
-            sessions: List[TmuxSession] = []
-            for session_name, data in session_data.items():
-                windows = data["windows"]
-                attached = data["attached"]
-                if isinstance(windows, list) and isinstance(attached, bool):
-                    sessions.append(
-                        TmuxSession(
-                            name=session_name,
-                            windows=windows,
-                            attached=attached,
-                        )
-                    )
+    def _cached_capture(self, window: TmuxWindow, num_lines: int) -> Optional[List[str]]:
+        """Return the previous capture of a window if its pane is unchanged"""
+        entry = self._hist_cache.get((window.session_name, window.window_index))
+        if entry is None:
+            return None
+        state, cached_lines, captured_at, content = entry
+        if state != self._pane_state(window) or cached_lines != num_lines:
+            return None
+        # window_activity has one-second resolution, so output in the same
+        # second as the capture may have landed after it
+        if window.activity >= int(captured_at):
+            return None
+        return list(content)
 
-            return sessions
-        except (subprocess.CalledProcessError, TmuxError) as e:
-            raise TmuxError(f"Error getting tmux sessions: {e}") from e
+    def _remember_capture(
+        self, window: TmuxWindow, num_lines: int, captured_at: float, content: List[str]
+    ) -> None:
+        """Store a capture for reuse while the window's pane state is unchanged"""
+        self._hist_cache[(window.session_name, window.window_index)] = (
+            self._pane_state(window),
+            num_lines,
+            captured_at,
+            tuple(content),  # Immutable, so callers cannot edit the cache
+        )
+
+    def _snapshot_window(self, session_name: str, window_index: int) -> Optional[TmuxWindow]:
+        """Look a window up in the cached session snapshot without querying tmux"""
+        cached = self._sessions_cache
+        if cached is None or time.monotonic() - cached[0] >= self.sessions_ttl:
+            return None
+        for session in cached[1]:
+            if session.name == session_name:
+                for window in session.windows:
+                    if window.window_index == window_index:
+                        return window
+        return None
+
+    @staticmethod
+    def _capture_cmd(session_name: str, window_index: int, num_lines: int) -> List[str]:
+        """capture-pane invocation; -J joins wrapped lines into their logical line"""
+        return [
+            "tmux",
+            "capture-pane",
+            "-p",
+            "-J",
+            "-t",
+            f"{session_name}:{window_index}",
+            "-S",
+            f"-{num_lines}",
+        ]
+
+    @staticmethod
+    def _pane_lines(text: str) -> List[str]:
+        """Split captured text into lines; -J keeps trailing spaces, so trim them"""
+        lines = text.split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        return [line.rstrip() for line in lines]
 
     def capture_window_content(
         self, session_name: str, window_index: int, num_lines: int = 50
-    ) -> str:
+    ) -> List[str]:
         """Safely capture the last N lines from a tmux window with streaming"""
         num_lines = min(num_lines, self.max_lines_capture)
 
+        # Skip the capture when a fresh snapshot shows the pane is unchanged
+        window = self._snapshot_window(session_name, window_index)
+        if window is not None:
+            cached = self._cached_capture(window, num_lines)
+            if cached is not None:
+                return cached
+        captured_at = time.time()
+
         try:
-            cmd = [
-                "tmux",
-                "capture-pane",
-                "-t",
-                f"{session_name}:{window_index}",
-                "-p",
-                "-S",
-                f"-{num_lines}",
-            ]
+            cmd = self._capture_cmd(session_name, window_index, num_lines)
 
             # Use streaming for large captures
             if num_lines > 100:
-                return self._safe_subprocess_stream(cmd)
+                content = self._safe_subprocess_stream(cmd)
+            else:
+                stdout, stderr, return_code = self._run_query(cmd)
+                if return_code != 0:
+                    raise TmuxError(f"Failed to capture window content: {stderr}")
+                content = self._pane_lines(stdout.decode("utf-8", "replace"))
 
-            stdout, stderr, return_code = self._safe_subprocess_large_output(cmd)
-            if return_code != 0:
-                raise TmuxError(f"Failed to capture window content: {stderr}")
-            return stdout
+            if window is not None:
+                self._remember_capture(window, num_lines, captured_at, content)
+            return content
+        except (subprocess.CalledProcessError, TmuxError) as e:
+            raise TmuxError(f"Error capturing window content: {e}") from e
+
+    def _capture_batch_cmd(self, targets: List[Tuple[str, int]], num_lines: int) -> List[str]:
+        """Build one tmux command list capturing every target, sentinel-separated"""
+        cmd = ["tmux"]
+        for session_name, window_index in targets:
+            cmd += self._capture_cmd(session_name, window_index, num_lines)[1:]
+            cmd += [
+                ";",
+                "display-message",
+                "-p",
+                self._CAPTURE_SENTINEL,
+                ";",
+            ]
+        return cmd
+
+    def _split_capture_batch(
+        self, stdout: bytes, stderr: str, return_code: int, count: int
+    ) -> List[List[str]]:
+        """Split batched capture output back into per-window contents"""
+        if return_code != 0:
+            raise TmuxError(f"Failed to capture window content: {stderr}")
+
+        parts = stdout.split(self._CAPTURE_SENTINEL.encode() + b"\n")
+        if len(parts) != count + 1:
+            raise TmuxError(f"Expected {count} captures, got {len(parts) - 1}")
+        return [self._pane_lines(part.decode("utf-8", "replace")) for part in parts[:-1]]
+
+    def _capture_batch(
+        self, targets: List[Tuple[str, int]], num_lines: int
+    ) -> List[List[str]]:
+        """Capture several windows with a single tmux command list"""
+        try:
+            stdout, stderr, return_code = self._run_query(
+                self._capture_batch_cmd(targets, num_lines)
+            )
+            return self._split_capture_batch(stdout, stderr, return_code, len(targets))
         except (subprocess.CalledProcessError, TmuxError) as e:
             raise TmuxError(f"Error capturing window content: {e}") from e
 
+    def _plan_captures(
+        self, windows: List[TmuxWindow], num_lines: int
+    ) -> Tuple[Dict[int, List[str]], List[int], List[List[Tuple[str, int]]]]:
+        """Split windows into reusable captures and batches that need tmux
+
+        Returns the reused contents by position, the positions still to
+        capture, and those positions' targets grouped into batches.
+        """
+        contents: Dict[int, List[str]] = {}
+        stale: List[int] = []
+        for i, window in enumerate(windows):
+            cached = self._cached_capture(window, num_lines)
+            if cached is None:
+                stale.append(i)
+            else:
+                contents[i] = cached
+
+        targets = [(windows[i].session_name, windows[i].window_index) for i in stale]
+        batches = [
+            targets[i : i + self.capture_batch_size]
+            for i in range(0, len(targets), self.capture_batch_size)
+        ]
+        return contents, stale, batches
+
+    def _merge_captures(
+        self,
+        windows: List[TmuxWindow],
+        num_lines: int,
+        captured_at: float,
+        contents: Dict[int, List[str]],
+        stale: List[int],
+        fresh: List[List[str]],
+    ) -> List[List[str]]:
+        """Remember fresh captures and return all contents in window order"""
+        for i, content in zip(stale, fresh):
+            contents[i] = content
+            self._remember_capture(windows[i], num_lines, captured_at, content)
+        return [contents[i] for i in range(len(windows))]
+
+    def _capture_windows(
+        self, windows: List[TmuxWindow], num_lines: int = 50
+    ) -> List[List[str]]:
+        """Capture many windows in batches, running the batches concurrently"""
+        num_lines = min(num_lines, self.max_lines_capture)
+        captured_at = time.time()
+
+        # Only windows whose pane changed since the last capture hit tmux
+        contents, stale, batches = self._plan_captures(windows, num_lines)
+        fresh: List[List[str]] = []
+        if len(batches) == 1:
+            fresh = self._capture_batch(batches[0], num_lines)
+        elif batches:
+            for batch_contents in self._get_executor().map(
+                lambda batch: self._capture_batch(batch, num_lines), batches
+            ):
+                fresh.extend(batch_contents)
+
+        return self._merge_captures(windows, num_lines, captured_at, contents, stale, fresh)
+
     def get_window_info(self, session_name: str, window_index: int) -> Dict[str, Any]:
         """Get detailed information about a specific window"""
         try:
@@ -235,30 +768,31 @@ class TmuxOrchestrator:
                 "-t",
                 f"{session_name}:{window_index}",
                 "-p",
-                "#{window_name}:#{window_active}:#{window_panes}:#{window_layout}",
+                "#{window_name}\x1f#{window_active}\x1f#{window_panes}\x1f#{window_layout}",
             ]
-            stdout, stderr, return_code = self._safe_subprocess_large_output(cmd)
+            stdout, stderr, return_code = self._run_query(cmd)
 
             if return_code != 0:
                 raise TmuxError(f"Failed to get window info: {stderr}")
 
-            if stdout.strip():
-                parts = stdout.strip().split(":")
+            line = stdout.rstrip(b"\n")
+            if line:
+                parts = line.split(b"\x1f", 3)
                 return {
-                    "name": parts[0],
-                    "active": parts[1] == "1",
+                    "name": parts[0].decode("utf-8", "replace"),
+                    "active": parts[1] == b"1",
                     "panes": int(parts[2]),
-                    "layout": parts[3],
+                    "layout": parts[3].decode("ascii", "replace"),
                     "content": self.capture_window_content(session_name, window_index),
                 }
             return {}  # Add missing return statement
         except (subprocess.CalledProcessError, TmuxError) as e:
             raise TmuxError(f"Could not get window info: {e}") from e
 
-    def send_keys_to_window(
-        self, session_name: str, window_index: int, keys: str, confirm: bool = True
+    def _send_keys(
+        self, session_name: str, window_index: int, keys: str, confirm: bool, enter: bool
     ) -> bool:
-        """Safely send keys to a tmux window with confirmation"""
+        """Send literal keys, optionally followed by Enter, in one tmux call"""
         if self.safety_mode and confirm:
             prompt = (
                 f"SAFETY CHECK: About to send '{keys}' to "
@@ -270,47 +804,103 @@ class TmuxOrchestrator:
 
         try:
             # Escape special characters to prevent command injection
-            # Escape special characters to prevent command injection
-            safe_keys = keys.replace(";", r"\;")
-            safe_keys = safe_keys.replace("$", r"\$")
-            safe_keys = safe_keys.replace("`", r"\`")
-            cmd = [
-                "tmux",
-                "send-keys",
-                "-l",
-                "-t",
-                f"{session_name}:{window_index}",
-                safe_keys,
-            ]
+            safe_keys = keys.translate(self._TMUX_ESCAPES)
+            target = f"{session_name}:{window_index}"
+            cmd = ["tmux", "send-keys", "-l", "-t", target, safe_keys]
+            if enter:
+                # -l only applies to the first command, so C-m stays a key name
+                cmd += [";", "send-keys", "-t", target, "C-m"]
             _, stderr, return_code = self._safe_subprocess_large_output(cmd)
+            self.invalidate_sessions()
             if return_code != 0:
                 raise TmuxError(f"Failed to send keys: {stderr}")
             return True
         except (subprocess.CalledProcessError, TmuxError) as e:
             raise TmuxError(f"Error sending keys: {e}") from e
 
+    def send_keys_to_window(
+        self, session_name: str, window_index: int, keys: str, confirm: bool = True
+    ) -> bool:
+        """Safely send keys to a tmux window with confirmation"""
+        return self._send_keys(session_name, window_index, keys, confirm, enter=False)
+
     def send_command_to_window(
         self, session_name: str, window_index: int, command: str, confirm: bool = True
     ) -> bool:
         """Send a command to a window (adds Enter automatically)"""
-        # First send the command text
-        if not self.send_keys_to_window(session_name, window_index, command, confirm):
-            return False
-        # Then send the actual Enter key (C-m)
-        try:
-            cmd = ["tmux", "send-keys", "-t", f"{session_name}:{window_index}", "C-m"]
-            _, stderr, return_code = self._safe_subprocess_large_output(cmd)
-            if return_code != 0:
-                raise TmuxError(f"Failed to send Enter key: {stderr}")
+        return self._send_keys(session_name, window_index, command, confirm, enter=True)
+
+    def _note_activity(self, window: TmuxWindow, now: float) -> None:
+        """Record when a window's pane state was last seen to change"""
+        key = (window.session_name, window.window_index)
+        state = self._pane_state(window)
+        previous = self._last_activity.get(key)
+        if previous is None:
+            # First sighting: trust tmux's own activity clock for the idle time
+            idle = max(0.0, time.time() - window.activity)
+            self._last_activity[key] = (state, now - idle)
+        elif previous[0] != state:
+            self._last_activity[key] = (state, now)
+
+    def poll_due(self, key: Tuple[str, int], now: float) -> bool:
+        """Check whether a (session, window) should be captured at monotonic time now
+
+        Windows that changed within the last 2s are polled every 0.5s, those
+        that changed within the last minute every 2.5s, the rest every 30s.
+        """
+        last_polled = self._last_polled.get(key)
+        if last_polled is None:
             return True
-        except (subprocess.CalledProcessError, TmuxError) as e:
-            raise TmuxError(f"Error sending Enter key: {e}") from e
+        activity = self._last_activity.get(key)
+        idle = now - activity[1] if activity is not None else float("inf")
+        for max_idle, interval in self._POLL_TIERS:
+            if idle < max_idle:
+                return now - last_polled >= interval
+        return now - last_polled >= self._FROZEN_POLL_INTERVAL
 
-    def get_all_windows_status(self) -> Dict[str, Any]:
-        """Get status of all windows across all sessions"""
-        sessions = self.get_tmux_sessions()
+    def _due_windows(
+        self, sessions: List[TmuxSession], only_due: bool
+    ) -> Tuple[List[TmuxWindow], List[TmuxWindow], float]:
+        """Record activity and pick the windows to capture on this pass"""
+        windows = [window for session in sessions for window in session.windows]
+        now = time.monotonic()
+        for window in windows:
+            self._note_activity(window, now)
+        if only_due:
+            due = [w for w in windows if self.poll_due((w.session_name, w.window_index), now)]
+        else:
+            due = windows
+        return windows, due, now
+
+    def _build_status(
+        self,
+        sessions: List[TmuxSession],
+        windows: List[TmuxWindow],
+        due: List[TmuxWindow],
+        contents: List[List[str]],
+        now: float,
+    ) -> Dict[str, Any]:
+        """Assemble the status dict and update per-window polling state"""
         window_status: Dict[str, Any] = {"timestamp": datetime.now().isoformat(), "sessions": []}
 
+        captured: Dict[Tuple[str, int], List[str]] = {}
+        for window, content in zip(due, contents):
+            key = (window.session_name, window.window_index)
+            captured[key] = content
+            self._last_polled[key] = now
+
+        # Forget state for windows that no longer exist
+        live = {(window.session_name, window.window_index) for window in windows}
+        self._hist_cache = {
+            key: entry for key, entry in self._hist_cache.items() if key in live
+        }
+        self._last_activity = {
+            key: entry for key, entry in self._last_activity.items() if key in live
+        }
+        self._last_polled = {
+            key: polled for key, polled in self._last_polled.items() if key in live
+        }
+
         for session in sessions:
             session_data = {
                 "name": session.name,
@@ -319,7 +909,18 @@ class TmuxOrchestrator:
             }
 
             for window in session.windows:
-                window_info = self.get_window_info(session.name, window.window_index)
+                # Metadata comes from the batched list-windows query
+                window_info = {
+                    "name": window.window_name,
+                    "active": window.active,
+                    "panes": window.panes,
+                    "layout": window.layout,
+                }
+                key = (window.session_name, window.window_index)
+                if key in captured:
+                    window_info["content"] = captured[key]
+                elif key in self._hist_cache:
+                    window_info["content"] = list(self._hist_cache[key][3])
                 window_data = {
                     "index": window.window_index,
                     "name": window.window_name,
@@ -336,55 +937,165 @@ class TmuxOrchestrator:
 
         return window_status
 
-    def find_window_by_name(self, window_name: str) -> List[Tuple[str, int]]:
-        """Find windows by name across all sessions"""
+    def get_all_windows_status(self, only_due: bool = False) -> Dict[str, Any]:
+        """Get status of all windows across all sessions
+
+        With only_due, windows that are not due per poll_due() are not
+        captured and report their previous capture, if any.
+        """
         sessions = self.get_tmux_sessions()
-        matches = []
+        windows, due, now = self._due_windows(sessions, only_due)
+        # One tmux invocation captures a whole batch of windows
+        contents = self._capture_windows(due)
+        return self._build_status(sessions, windows, due, contents, now)
 
-        for session in sessions:
-            for window in session.windows:
-                if window_name.lower() in window.window_name.lower():
-                    matches.append((session.name, window.window_index))
+    async def _safe_subprocess_async(
+        self, cmd: List[str], timeout: Optional[int] = None
+    ) -> Tuple[bytes, str, int]:
+        """Run a tmux command without blocking the event loop"""
+        if timeout is None:
+            timeout = self.cmd_timeout
+
+        proc = await asyncio.create_subprocess_exec(
+            self._tmux_path or cmd[0],
+            *cmd[1:],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            close_fds=False,  # Required for the posix_spawn fast path
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError as exc:
+            proc.kill()
+            await proc.wait()
+            raise TmuxError(f"Command timeout after {timeout}s: {cmd}") from exc
+        return stdout, stderr.decode("utf-8", "replace"), await proc.wait()
+
+    async def get_tmux_sessions_async(self) -> List[TmuxSession]:
+        """Async variant of get_tmux_sessions; both list queries run concurrently"""
+        cached = self._cached_sessions()
+        if cached is not None:
+            return cached
+
+        try:
+            (sessions_stdout, sessions_stderr, sessions_rc), (
+                windows_stdout,
+                windows_stderr,
+                windows_rc,
+            ) = await asyncio.gather(
+                self._safe_subprocess_async(list(self._LIST_SESSIONS_CMD)),
+                self._safe_subprocess_async(list(self._LIST_WINDOWS_CMD)),
+            )
+            if sessions_rc != 0:
+                raise TmuxError(f"Failed to get sessions: {sessions_stderr}")
+            if windows_rc != 0:
+                raise TmuxError(f"Failed to get all windows: {windows_stderr}")
+
+            sessions = self._parse_sessions(sessions_stdout, windows_stdout)
+            self._cache_sessions(sessions)
+            return list(sessions)
+        except TmuxError as e:
+            raise TmuxError(f"Error getting tmux sessions: {e}") from e
 
-        return matches
+    async def capture_window_content_async(
+        self, session_name: str, window_index: int, num_lines: int = 50
+    ) -> List[str]:
+        """Async variant of capture_window_content"""
+        num_lines = min(num_lines, self.max_lines_capture)
+
+        window = self._snapshot_window(session_name, window_index)
+        if window is not None:
+            cached = self._cached_capture(window, num_lines)
+            if cached is not None:
+                return cached
+        captured_at = time.time()
+
+        try:
+            cmd = self._capture_cmd(session_name, window_index, num_lines)
+            stdout, stderr, return_code = await self._safe_subprocess_async(cmd)
+            if return_code != 0:
+                raise TmuxError(f"Failed to capture window content: {stderr}")
+
+            content = self._pane_lines(stdout.decode("utf-8", "replace"))
+            if window is not None:
+                self._remember_capture(window, num_lines, captured_at, content)
+            return content
+        except TmuxError as e:
+            raise TmuxError(f"Error capturing window content: {e}") from e
+
+    async def _capture_batch_async(
+        self, targets: List[Tuple[str, int]], num_lines: int
+    ) -> List[List[str]]:
+        """Async variant of _capture_batch"""
+        try:
+            stdout, stderr, return_code = await self._safe_subprocess_async(
+                self._capture_batch_cmd(targets, num_lines)
+            )
+            return self._split_capture_batch(stdout, stderr, return_code, len(targets))
+        except TmuxError as e:
+            raise TmuxError(f"Error capturing window content: {e}") from e
+
+    async def get_all_windows_status_async(self, only_due: bool = False) -> Dict[str, Any]:
+        """Async variant of get_all_windows_status; capture batches overlap"""
+        sessions = await self.get_tmux_sessions_async()
+        windows, due, now = self._due_windows(sessions, only_due)
+
+        num_lines = min(50, self.max_lines_capture)
+        captured_at = time.time()
+        contents, stale, batches = self._plan_captures(due, num_lines)
+        results = await asyncio.gather(
+            *(self._capture_batch_async(batch, num_lines) for batch in batches)
+        )
+        fresh = [content for batch_contents in results for content in batch_contents]
+        merged = self._merge_captures(due, num_lines, captured_at, contents, stale, fresh)
+        return self._build_status(sessions, windows, due, merged, now)
+
+    def find_window_by_name(self, window_name: str) -> List[Tuple[str, int]]:
+        """Find windows by name across all sessions"""
+        self.get_tmux_sessions()  # Refreshes _soa_cache when the snapshot is stale
+        names_cf, session_idx = self._soa_cache
+        needle = window_name.casefold()
+
+        return [session_idx[i] for i, name in enumerate(names_cf) if needle in name]
 
     def create_monitoring_snapshot(self) -> str:
         """Create a comprehensive snapshot for Claude analysis"""
         window_status = self.get_all_windows_status()
 
         # Format for Claude consumption
-        snapshot = f"Tmux Monitoring Snapshot - {window_status['timestamp']}\n"
-        snapshot += "=" * 50 + "\n\n"
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Tmux Monitoring Snapshot - {window_status['timestamp']}\n")
+        w("=" * 50 + "\n\n")
 
         for session in window_status["sessions"]:
             attached = 'ATTACHED' if session['attached'] else 'DETACHED'
-            snapshot += f"Session: {session['name']} ({attached})\n"
-            snapshot += "-" * 30 + "\n"
+            w(f"Session: {session['name']} ({attached})\n")
+            w("-" * 30 + "\n")
 
             for window in session["windows"]:
-                snapshot += f"  Window {window['index']}: {window['name']}"
-                if window["active"]:
-                    snapshot += " (ACTIVE)"
-                snapshot += "\n"
+                active = " (ACTIVE)" if window["active"] else ""
+                w(f"  Window {window['index']}: {window['name']}{active}\n")
 
                 if "content" in window["info"]:
-                    # Get last 10 lines for overview
-                    content_lines = window["info"]["content"].split("\n")
-                    recent_lines = (
-                        content_lines[-10:]
-                        if len(content_lines) > 10
-                        else content_lines
-                    )
-                    snapshot += "    Recent output:\n"
-                    for line in recent_lines:
-                        if line.strip():
-                            snapshot += f"    | {line}\n"
-                snapshot += "\n"
+                    # Get last 10 lines for overview; content is already split
+                    recent_lines = window["info"]["content"][-10:]
+                    w("    Recent output:\n")
+                    buf.writelines(f"    | {line}\n" for line in recent_lines if line.strip())
+                w("\n")
 
-        return snapshot
+        return buf.getvalue()
 
 
 if __name__ == "__main__":
     orchestrator = TmuxOrchestrator()
     status = orchestrator.get_all_windows_status()
-    print(json.dumps(status, indent=2))
+    try:
+        import orjson
+    except ImportError:
+        print(json.dumps(status, indent=2))
+    else:
+        # Optional fast path: orjson serializes straight to UTF-8 bytes
+        sys.stdout.buffer.write(
+            orjson.dumps(status, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )